@@ -1,10 +1,19 @@
 import sys
 import os
+import io
 import struct
 import math
-import tempfile
+import time
+import array
+import functools
 import threading
 
+# numpy 可选：有就向量化生成铃声，没有就退回纯 Python
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 # 引入 pygame 处理音频
 import pygame
 
@@ -12,64 +21,149 @@ from PySide6.QtWidgets import (QApplication, QWidget, QSystemTrayIcon, QMenu,
                                QInputDialog, QDialog, QLabel, QPushButton, QVBoxLayout,
                                QHBoxLayout, QFontDialog, QGraphicsDropShadowEffect, QFileDialog, QMessageBox)
 from PySide6.QtCore import (QTimer, Qt, QTime, QPoint, QRectF, QUrl,
-                            QPropertyAnimation, QEasingCurve, QPointF, QSettings, QSize, QRect)
-from PySide6.QtGui import (QPainter, QColor, QPen, QBrush, QFont, QImage,
-                           QAction, QPainterPath, QLinearGradient, QCursor, QPixmap, QBitmap)
+                            QPropertyAnimation, QAbstractAnimation, QEasingCurve, QPointF, QSettings, QSize, QRect)
+from PySide6.QtGui import (QPainter, QColor, QPen, QBrush, QFont, QFontMetrics, QImage,
+                           QAction, QPolygonF, QLinearGradient, QCursor, QPixmap, QPixmapCache, QBitmap)
+
+
+# --- 🔔 内置铃声 (880Hz 哔哔声, 内存中生成, 只算一次) ---
+@functools.lru_cache(maxsize=None)
+def _build_builtin_wav():
+    duration_sec = 2
+    sample_rate = 44100
+    n_samples = int(sample_rate * duration_sec)
+    header = struct.pack('<4sI4s', b'RIFF', 36 + n_samples * 2, b'WAVE')
+    fmt = struct.pack('<4sIHHIIHH', b'fmt ', 16, 1, 1, sample_rate, sample_rate * 2, 2, 16)
+    data_header = struct.pack('<4sI', b'data', n_samples * 2)
+    freq = 880
+    volume = 20000
+    if np is not None:
+        t = np.arange(n_samples, dtype=np.float64) / sample_rate
+        env = np.mod(t, 0.5) < 0.1
+        samples = (volume * np.sin(2 * np.pi * freq * t) * env).astype('<i2').tobytes()
+    else:
+        def sample(i):
+            t = i / sample_rate
+            return int(volume * math.sin(2 * math.pi * freq * t)) if (t % 0.5) < 0.1 else 0
+
+        samples = array.array('h', map(sample, range(n_samples)))
+        if sys.byteorder == 'big': samples.byteswap()
+        samples = samples.tobytes()
+    return header + fmt + data_header + samples
 
 
 # --- 🎵 音频管理器 ---
 class AudioManager:
     def __init__(self):
-        try:
-            pygame.mixer.init()
+        # 打开声卡要 100~300ms，推迟到第一次用到 (或后台预热) 时再做；None 表示还没初始化
+        self.is_ready = None
+        self._init_lock = threading.RLock()
+        self.builtin_alarm = None
+        self._user_sound = None
+        self._user_sound_path = None
+
+    def _lazy_init(self):
+        if self.is_ready is not None: return
+        with self._init_lock:
+            if self.is_ready is not None: return
+            try:
+                pygame.mixer.init()
+            except Exception as e:
+                print(f"Pygame init failed: {e}")
+                self.is_ready = False
+                return
+            # 内置铃声先建好，最后才公开 is_ready：其他线程看到 True 时 builtin_alarm 已就位
+            self._get_builtin_alarm()
             self.is_ready = True
-        except Exception as e:
-            print(f"Pygame init failed: {e}")
-            self.is_ready = False
-        self.builtin_alarm = self._create_builtin_wav()
 
-    def _create_builtin_wav(self):
+    def warmup(self):
+        # 窗口显示后在后台把声卡和内置铃声准备好，不卡启动
+        threading.Thread(target=self._lazy_init, daemon=True).start()
+
+    def preload(self, file_path):
+        # 后台线程把自定义铃声解码成 Sound，响铃时不再读盘
+        if self.is_ready is False or not file_path: return
+        if file_path == self._user_sound_path and self._user_sound is not None: return
+        self._user_sound = None
+        self._user_sound_path = file_path
+        threading.Thread(target=self._load_user_sound, args=(file_path,), daemon=True).start()
+
+    def _load_user_sound(self, file_path):
+        self._lazy_init()
+        if not self.is_ready: return
         try:
-            duration_sec = 2
-            sample_rate = 44100
-            n_samples = int(sample_rate * duration_sec)
-            temp_file = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
-            header = struct.pack('<4sI4s', b'RIFF', 36 + n_samples * 2, b'WAVE')
-            fmt = struct.pack('<4sIHHIIHH', b'fmt ', 16, 1, 1, sample_rate, sample_rate * 2, 2, 16)
-            data_header = struct.pack('<4sI', b'data', n_samples * 2)
-            with open(temp_file.name, 'wb') as f:
-                f.write(header);
-                f.write(fmt);
-                f.write(data_header)
-                freq = 880
-                volume = 20000
-                for i in range(n_samples):
-                    t = i / sample_rate
-                    if (t % 0.5) < 0.1:
-                        sample = volume * math.sin(2 * math.pi * freq * t)
-                    else:
-                        sample = 0
-                    f.write(struct.pack('<h', int(sample)))
-            return temp_file.name
-        except:
-            return None
+            sound = pygame.mixer.Sound(file_path)
+        except Exception as e:
+            print(f"Preload Error: {e}")
+            return
+        if file_path == self._user_sound_path:
+            self._user_sound = sound
+
+    def _get_builtin_alarm(self):
+        # 第一次响铃时才从内存字节创建 Sound，不再写临时文件
+        with self._init_lock:
+            if self.builtin_alarm is None:
+                try:
+                    self.builtin_alarm = pygame.mixer.Sound(file=io.BytesIO(_build_builtin_wav()))
+                except Exception as e:
+                    print(f"Builtin alarm failed: {e}")
+            return self.builtin_alarm
 
     def play(self, file_path=None):
+        self._lazy_init()
         if not self.is_ready: return
         try:
-            pygame.mixer.music.stop()
+            self.stop()
+            if file_path and file_path == self._user_sound_path and self._user_sound is not None:
+                self._user_sound.play(loops=-1)
+                return
             if file_path and os.path.exists(file_path):
+                # 预加载还没好 (或解码失败)：退回原来的 music 流式播放，在 UI 线程同步 load
                 pygame.mixer.music.load(file_path)
                 pygame.mixer.music.play(-1)
                 return
-            if self.builtin_alarm:
-                pygame.mixer.music.load(self.builtin_alarm)
-                pygame.mixer.music.play(-1)
+            alarm = self._get_builtin_alarm()
+            if alarm:
+                alarm.play(loops=-1)
         except Exception as e:
             print(f"Play Error: {e}")
 
     def stop(self):
-        if self.is_ready: pygame.mixer.music.stop()
+        if not self.is_ready: return
+        pygame.mixer.music.stop()
+        if self.builtin_alarm: self.builtin_alarm.stop()
+        if self._user_sound is not None: self._user_sound.stop()
+
+
+# --- 💾 设置缓存 (内存读写，500ms 防抖后统一落盘) ---
+class SettingsCache:
+    def __init__(self, organization, application, delay_ms=500):
+        self._qs = QSettings(organization, application)
+        self._cache = {}
+        self._dirty = {}
+        self._flush_timer = QTimer()
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(delay_ms)
+        self._flush_timer.timeout.connect(self.flush)
+
+    def value(self, key, default=None):
+        if key not in self._cache:
+            self._cache[key] = self._qs.value(key, default)
+        return self._cache[key]
+
+    def setValue(self, key, value):
+        if key in self._cache and self._cache[key] == value: return
+        self._cache[key] = value
+        self._dirty[key] = value
+        self._flush_timer.start()
+
+    def flush(self):
+        self._flush_timer.stop()
+        if not self._dirty: return
+        for key, value in self._dirty.items():
+            self._qs.setValue(key, value)
+        self._dirty.clear()
+        self._qs.sync()
 
 
 # --- 🛠️ 主题弹窗 ---
@@ -125,17 +219,19 @@ class ThemeDialog(QDialog):
         shadow.setOffset(0, 5)
         self.setGraphicsEffect(shadow)
 
+        # 画笔/画刷只和主题有关，建一次反复用
+        self._brush_bg = QBrush(QColor("#FFFAFA"))
+        self._pen_border = QPen(self.theme["colors"][0], 2)
+
     def paintEvent(self, event):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
 
-        bg_color = QColor("#FFFAFA")
-
-        painter.setBrush(QBrush(bg_color))
+        painter.setBrush(self._brush_bg)
         painter.setPen(Qt.PenStyle.NoPen)
         painter.drawRoundedRect(self.rect(), 20, 20)
 
-        painter.setPen(QPen(self.theme["colors"][0], 2))
+        painter.setPen(self._pen_border)
         painter.setBrush(Qt.BrushStyle.NoBrush)
         painter.drawRoundedRect(self.rect().adjusted(1, 1, -1, -1), 20, 20)
 
@@ -144,7 +240,8 @@ class UltimatePomodoro(QWidget):
     def __init__(self):
         super().__init__()
 
-        self.settings = QSettings("MyCompany", "PomodoroProV19")
+        self.settings = SettingsCache("MyCompany", "PomodoroProV19")
+        QApplication.instance().aboutToQuit.connect(self.settings.flush)
 
         # --- 核心数据 ---
         self.work_duration = int(self.settings.value("work_duration", 25))
@@ -155,6 +252,7 @@ class UltimatePomodoro(QWidget):
         self.custom_mp3_path = self.settings.value("custom_mp3_path", "")
 
         self.audio_mgr = AudioManager()
+        self.audio_mgr.preload(self.custom_mp3_path)
 
         self.total_time = self.work_duration * 60
         self.current_time = self.total_time
@@ -171,6 +269,7 @@ class UltimatePomodoro(QWidget):
         self.is_hovering_btn = False
         self.dock_pos = None
         self.drag_pos = None
+        self._pos_anim = None
 
         # --- 🎨 主题库 ---
         self.themes = {
@@ -216,77 +315,230 @@ class UltimatePomodoro(QWidget):
                 "text": QColor(70, 70, 70)
             }
         }
+        # 当前主题 dict 只在切换主题时解析一次，paintEvent 直接读属性
+        self._theme = self.themes.get(self.current_theme, self.themes["Doro"])
 
         self.char_pixmap = None
+        self.char_pixmap_scaled = None
+        self._char_pixmaps = {}  # img_name -> (原图, 缩放图)，切回主题不再 stat/解码
+        # 核心修改：让图片的目标宽度 == 胶囊宽度 (160px)
+        # 这样就能充分利用宽度，不会小
+        self.char_target_w = 180
         self.load_theme_image()
 
         self.init_ui()
         self.init_tray()
 
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.tick_timer)
-        self.timer.start(1000)
-
-        self.ui_timer = QTimer(self)
-        self.ui_timer.timeout.connect(self.update)
-        self.ui_timer.start(30)
-
-        self.dock_timer = QTimer(self)
-        self.dock_timer.timeout.connect(self.check_docking)
-        self.dock_timer.start(50)
-
-        self._pos_anim = None
+        # 剩余时间按单调时钟计算，QTimer 只负责唤醒，晚到/合并触发都不会丢秒
+        self._t0 = 0.0
+        self._remaining_at_start = float(self.current_time)
+        self._paused_remaining = None  # 暂停时保留的精确剩余秒数 (float)，不丢不足一秒的部分
+        # 不再 30ms 强制重绘：状态变化时才 update()，系统时间每秒检查一次
+        self._clock_str = QTime.currentTime().toString("HH:mm")
+
+        # 唯一的 timer：250ms 一跳，倒计时每跳都算，系统时钟每 4 跳 (1s) 查一次
+        self._phase = 0
+        self._master_timer = QTimer(self)
+        self._master_timer.timeout.connect(self._tick)
+        self._master_timer.start(250)
+
+        # 绘制缓存 (按主题重建)
+        self._cached_theme_key = None
+        self._pen_track = None
+        self._pen_progress_normal = None
+        self._pen_progress_urgent = None
+        self._brush_bg = None
+        self._text_colors = {}
+        self._border_pen_normal = None
+        self._border_pen_urgent = None
+
+    def _tick(self):
+        self._phase = (self._phase + 1) % 4
+        self.tick_timer()
+        if self._phase == 0 and self.isVisible():
+            self.refresh_clock()
+
+    def refresh_clock(self):
+        clock_str = QTime.currentTime().toString("HH:mm")
+        if clock_str != self._clock_str:
+            self._clock_str = clock_str
+            self.update()
 
     def load_theme_image(self):
-        theme = self.themes.get(self.current_theme, self.themes["Doro"])
-        img_name = theme.get("char_img")
+        img_name = self._theme.get("char_img")
+        if img_name in self._char_pixmaps:
+            self.char_pixmap, self.char_pixmap_scaled = self._char_pixmaps[img_name]
+            return
 
         if img_name and os.path.exists(img_name):
             self.char_pixmap = QPixmap(img_name)
         else:
             self.char_pixmap = None
 
+        # 缩放只做一次：目标宽度固定，没必要每帧 SmoothTransformation
+        self.char_pixmap_scaled = None
+        if self.char_pixmap and not self.char_pixmap.isNull():
+            self.char_pixmap_scaled = self.char_pixmap.scaledToWidth(
+                self.char_target_w,
+                Qt.TransformationMode.SmoothTransformation
+            )
+        self._char_pixmaps[img_name] = (self.char_pixmap, self.char_pixmap_scaled)
+
     def init_ui(self):
         self.setWindowFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.WindowStaysOnTopHint | Qt.WindowType.Tool)
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
         self.setFixedSize(self.window_size, self.window_size)
+        self.init_geometry()
         self.center_on_screen()
         self.setWindowOpacity(self.normal_opacity)
+        self.init_fonts()
+
+    def init_geometry(self):
+        # 窗口尺寸固定，绘制用到的几何量启动时算好
+        margin = 10
+        draw_rect = self.rect().adjusted(margin, margin, -margin, -margin)
+        self._orb_radius = draw_rect.width() / 2
+        self._orb_center = QPointF(draw_rect.center())
+        self._track_radius = self._orb_radius - 5
+        cx, cy, r_ring = self._orb_center.x(), self._orb_center.y(), self._track_radius
+        self._arc_rect = QRectF(cx - r_ring, cy - r_ring, r_ring * 2, r_ring * 2)
+        self._sys_time_rect = QRectF(0, 35, self.window_size, 20)
+        self._break_rect = QRectF(0, self.window_size - 50, self.window_size, 30)
+
+        # 播放/暂停按钮：三角形和两根竖条
+        btn_x, btn_y = cx, cy + 45
+        self._play_poly = QPolygonF([QPointF(btn_x - 4, btn_y - 8), QPointF(btn_x + 8, btn_y),
+                                     QPointF(btn_x - 4, btn_y + 8)])
+        bar_w, bar_h = 6, 18
+        self._pause_bars = (QRectF(btn_x - 8, btn_y - bar_h / 2, bar_w, bar_h),
+                            QRectF(btn_x + 2, btn_y - bar_h / 2, bar_w, bar_h))
+
+        # 胶囊：每个吸附方向一个，位置预先摆好
+        self._capsule_rects = {}
+        for pos in ('left', 'right', 'top'):
+            capsule_rect = QRectF(0, 0, self.capsule_w, self.capsule_h)
+            if pos == 'left':
+                capsule_rect.moveBottom(self.window_size - 10)
+                capsule_rect.moveLeft(0)
+            elif pos == 'right':
+                capsule_rect.moveBottom(self.window_size - 10)
+                capsule_rect.moveRight(self.window_size)
+            elif pos == 'top':
+                capsule_rect.moveTop(0)
+                capsule_rect.moveLeft((self.window_size - self.capsule_w) / 2)
+            self._capsule_rects[pos] = capsule_rect
+        self._capsule_text_rects = {pos: rect.adjusted(0, -2, 0, 0) for pos, rect in self._capsule_rects.items()}
+
+    def init_fonts(self):
+        # 字体对象只在启动/换字体时创建，paintEvent 里直接复用
+        self._font_time = QFont(self.custom_font_family, 38, QFont.Weight.Bold)
+        self._font_sys = QFont("Segoe UI", 9)
+        self._font_break = QFont("Microsoft YaHei", 10, QFont.Weight.Bold)
+        self._font_capsule = QFont("Segoe UI", 26, QFont.Weight.Bold)
+        self._fm_time = QFontMetrics(self._font_time)
+        self._time_str_cache = (None, "", 0)
+
+    def time_text(self):
+        # (current_time, "MM:SS", 38号字宽度)，只在 current_time 变化后重新格式化/测量
+        cached_time, time_str, w = self._time_str_cache
+        if cached_time != self.current_time:
+            mins, secs = divmod(self.current_time, 60)
+            time_str = f"{mins:02d}:{secs:02d}"
+            w = self._fm_time.horizontalAdvance(time_str)
+            self._time_str_cache = (self.current_time, time_str, w)
+        return time_str, w
 
     def center_on_screen(self):
         screen = self.screen().geometry()
         self.move((screen.width() - self.width()) // 2, (screen.height() - self.height()) // 2)
 
     def paintEvent(self, event):
+        # 看不见就不画 (隐藏/最小化/被完全挡住)
+        if not self.isVisible() or self.visibleRegion().isEmpty(): return
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
 
-        theme = self.themes.get(self.current_theme, self.themes["Doro"])
+        theme = self._theme
         colors = theme["colors"]
         is_urgent = (self.current_time <= 5 and self.is_running)
+        self.update_paint_cache(theme, colors)
 
         if self.dock_pos is None:
             self.draw_orb_mode(painter, theme, colors, is_urgent)
         else:
             self.draw_docked_mode(painter, theme, colors, is_urgent)
 
-    def draw_orb_mode(self, painter, theme, colors, is_urgent):
-        margin = 10
-        draw_rect = self.rect().adjusted(margin, margin, -margin, -margin)
-        radius = draw_rect.width() / 2
-        center = draw_rect.center()
+    def update_paint_cache(self, theme, colors):
+        if self._cached_theme_key == self.current_theme:
+            return
+        self._cached_theme_key = self.current_theme
 
-        # --- 1. 背景 ---
-        bg = theme.get("bg")
-        painter.setBrush(QBrush(bg))
-        painter.setPen(Qt.PenStyle.NoPen)
-        painter.drawEllipse(center, radius, radius)
+        self._brush_bg = QBrush(theme.get("bg"))
+
+        # 文字颜色: is_urgent -> (正文, 系统时间 alpha 200, 按钮未悬停 alpha 150)
+        self._text_colors = {}
+        for urgent, color in ((False, theme.get("text", QColor(255, 255, 255))), (True, QColor(255, 0, 0))):
+            sys_color = QColor(color)
+            sys_color.setAlpha(200)
+            dim_color = QColor(color)
+            dim_color.setAlpha(150)
+            self._text_colors[urgent] = (color, sys_color, dim_color)
+
+        # 胶囊边框：普通/紧急两支，cosmetic 让描边开销与变换无关
+        self._border_pen_normal = QPen(colors[0], 2)
+        self._border_pen_normal.setCosmetic(True)
+        self._border_pen_urgent = QPen(QColor(255, 0, 0), 3)
+        self._border_pen_urgent.setCosmetic(True)
 
-        # --- 2. 轨道 ---
         track_color = QColor(colors[0])
         track_color.setAlpha(60)
-        painter.setPen(QPen(track_color, 8, Qt.PenStyle.SolidLine, Qt.PenCapStyle.RoundCap))
-        painter.drawEllipse(center, radius - 5, radius - 5)
+        self._pen_track = QPen(track_color, 8, Qt.PenStyle.SolidLine, Qt.PenCapStyle.RoundCap)
+
+        # 渐变只铺在圆环的外接矩形上，不再从窗口角到角 (大半颜色都落在环外)
+        arc_from, arc_to = self._arc_rect.topLeft(), self._arc_rect.bottomRight()
+        self._grad_normal = QLinearGradient(arc_from, arc_to)
+        self._grad_normal.setColorAt(0, colors[0])
+        self._grad_normal.setColorAt(1, colors[1])
+        self._pen_progress_normal = QPen(QBrush(self._grad_normal), 8, Qt.PenStyle.SolidLine, Qt.PenCapStyle.RoundCap)
+
+        self._grad_urgent = QLinearGradient(arc_from, arc_to)
+        self._grad_urgent.setColorAt(0, QColor(255, 80, 80))
+        self._grad_urgent.setColorAt(1, QColor(255, 0, 0))
+        self._pen_progress_urgent = QPen(QBrush(self._grad_urgent), 8, Qt.PenStyle.SolidLine, Qt.PenCapStyle.RoundCap)
+
+    def orb_background_key(self):
+        return f"orb_bg_{self.current_theme}_{self.window_size}_{self.devicePixelRatioF()}"
+
+    def orb_background_pixmap(self):
+        key = self.orb_background_key()
+        pix = QPixmapCache.find(key)
+        if pix is not None and not pix.isNull():
+            return pix
+
+        # 预乘 alpha 格式：贴图合成时省掉逐像素乘法，是 Qt 最快的混合路径
+        dpr = self.devicePixelRatioF()
+        img = QImage(self.size() * dpr, QImage.Format.Format_ARGB32_Premultiplied)
+        img.setDevicePixelRatio(dpr)
+        img.fill(Qt.GlobalColor.transparent)
+
+        p = QPainter(img)
+        p.setRenderHint(QPainter.RenderHint.Antialiasing)
+        p.setBrush(self._brush_bg)
+        p.setPen(Qt.PenStyle.NoPen)
+        p.drawEllipse(self._orb_center, self._orb_radius, self._orb_radius)
+        p.setPen(self._pen_track)
+        p.drawEllipse(self._orb_center, self._track_radius, self._track_radius)
+        p.end()
+
+        pix = QPixmap.fromImage(img)
+        QPixmapCache.insert(key, pix)
+        return pix
+
+    def draw_orb_mode(self, painter, theme, colors, is_urgent):
+        center = self._orb_center
+
+        # --- 1+2. 背景 + 轨道 (静态部分，预渲染后直接贴图) ---
+        painter.drawPixmap(0, 0, self.orb_background_pixmap())
 
         # --- 3. 进度条 ---
         if self.total_time > 0:
@@ -294,77 +546,39 @@ class UltimatePomodoro(QWidget):
             start_angle = 90 * 16
             span_angle = int(-progress * 360 * 16)
 
-            grad = QLinearGradient(0, 0, self.window_size, self.window_size)
-            if is_urgent:
-                grad.setColorAt(0, QColor(255, 80, 80))
-                grad.setColorAt(1, QColor(255, 0, 0))
-            else:
-                grad.setColorAt(0, colors[0])
-                grad.setColorAt(1, colors[1])
-
-            painter.setPen(QPen(QBrush(grad), 8, Qt.PenStyle.SolidLine, Qt.PenCapStyle.RoundCap))
-            r_ring = radius - 5
-            painter.drawArc(QRectF(center.x() - r_ring, center.y() - r_ring, r_ring * 2, r_ring * 2), start_angle,
-                            span_angle)
+            painter.setPen(self._pen_progress_urgent if is_urgent else self._pen_progress_normal)
+            painter.drawArc(self._arc_rect, start_angle, span_angle)
 
         # --- 4. 文字 ---
-        if is_urgent:
-            main_text_color = QColor(255, 0, 0)
-        else:
-            main_text_color = theme.get("text", QColor(255, 255, 255))
+        main_text_color, sys_color, dim_color = self._text_colors[is_urgent]
 
         painter.setPen(main_text_color)
-        painter.setFont(QFont(self.custom_font_family, 38, QFont.Weight.Bold))
-        mins, secs = divmod(self.current_time, 60)
-        time_str = f"{mins:02d}:{secs:02d}"
-
-        fm = painter.fontMetrics()
-        w = fm.horizontalAdvance(time_str)
+        painter.setFont(self._font_time)
+        time_str, w = self.time_text()
         painter.drawText(QPointF(center.x() - w / 2, center.y() + 5), time_str)
 
         # --- 5. 系统时间 ---
-        painter.setFont(QFont("Segoe UI", 9))
-        sys_color = QColor(main_text_color)
-        sys_color.setAlpha(200)
+        painter.setFont(self._font_sys)
         painter.setPen(sys_color)
-        painter.drawText(QRectF(0, 35, self.window_size, 20), Qt.AlignmentFlag.AlignCenter,
-                         QTime.currentTime().toString("HH:mm"))
+        painter.drawText(self._sys_time_rect, Qt.AlignmentFlag.AlignCenter, self._clock_str)
 
         # --- 6. 按钮 ---
-        self.draw_button(painter, center, main_text_color)
+        self.draw_button(painter, main_text_color if self.is_hovering_btn else dim_color)
 
         # --- 7. 休息状态 ---
         if self.mode == "BREAK":
-            painter.setFont(QFont("Microsoft YaHei", 10, QFont.Weight.Bold))
+            painter.setFont(self._font_break)
             painter.setPen(colors[1])
-            painter.drawText(QRectF(0, self.window_size - 50, self.window_size, 30), Qt.AlignmentFlag.AlignCenter,
-                             "💤 休息中~")
+            painter.drawText(self._break_rect, Qt.AlignmentFlag.AlignCenter, "💤 休息中~")
 
     def draw_docked_mode(self, painter, theme, colors, is_urgent):
         # 1. 绘制胶囊 (底部)
-        capsule_rect = QRectF(0, 0, self.capsule_w, self.capsule_h)
-
-        if self.dock_pos == 'left':
-            capsule_rect.moveBottom(self.window_size - 10)
-            capsule_rect.moveLeft(0)
-        elif self.dock_pos == 'right':
-            capsule_rect.moveBottom(self.window_size - 10)
-            capsule_rect.moveRight(self.window_size)
-        elif self.dock_pos == 'top':
-            capsule_rect.moveTop(0)
-            capsule_rect.moveLeft((self.window_size - self.capsule_w) / 2)
+        capsule_rect = self._capsule_rects[self.dock_pos]
 
         # --- 2. 绘制 Doro (位于胶囊上方，宽度对齐胶囊) ---
-        if self.char_pixmap and not self.char_pixmap.isNull():
-            # 核心修改：让图片的目标宽度 == 胶囊宽度 (160px)
-            # 这样就能充分利用宽度，不会小
-            target_w = 180
-
-            # 使用 scaledToWidth 按比例缩放，SmoothTransformation 保证高清
-            scaled_doro = self.char_pixmap.scaledToWidth(
-                int(target_w),
-                Qt.TransformationMode.SmoothTransformation
-            )
+        if self.char_pixmap_scaled is not None:
+            # load_theme_image 里已按比例缩放好 (SmoothTransformation 保证高清)
+            scaled_doro = self.char_pixmap_scaled
 
             # 计算绘制位置：居中对齐胶囊，脚底踩在胶囊上边缘
             draw_x = capsule_rect.left() + (capsule_rect.width() - scaled_doro.width()) / 2
@@ -380,49 +594,30 @@ class UltimatePomodoro(QWidget):
             painter.drawPixmap(int(draw_x), int(draw_y), scaled_doro)
 
         # --- 3. 绘制胶囊本体 ---
-        bg = theme.get("bg")
-        painter.setBrush(bg)
+        painter.setBrush(self._brush_bg)
         painter.setPen(Qt.PenStyle.NoPen)
         painter.drawRoundedRect(capsule_rect, 25, 25)
 
-        border_color = QColor(255, 0, 0) if is_urgent else colors[0]
-        painter.setPen(QPen(border_color, 3 if is_urgent else 2))
+        painter.setPen(self._border_pen_urgent if is_urgent else self._border_pen_normal)
         painter.setBrush(Qt.BrushStyle.NoBrush)
         painter.drawRoundedRect(capsule_rect, 25, 25)
 
-        if is_urgent:
-            text_color = QColor(255, 0, 0)
-        else:
-            text_color = theme.get("text")
+        text_color = self._text_colors[is_urgent][0]
 
         painter.setPen(text_color)
-        painter.setFont(QFont("Segoe UI", 26, QFont.Weight.Bold))
-        mins, secs = divmod(self.current_time, 60)
-        painter.drawText(capsule_rect.adjusted(0, -2, 0, 0), Qt.AlignmentFlag.AlignCenter, f"{mins:02d}:{secs:02d}")
-
-    def draw_button(self, painter, center, color):
-        btn_y = center.y() + 45
-        display_color = color
-        if not self.is_hovering_btn:
-            alpha = 150
-            display_color = QColor(color.red(), color.green(), color.blue(), alpha)
-        painter.setBrush(display_color)
+        painter.setFont(self._font_capsule)
+        time_str, _ = self.time_text()
+        painter.drawText(self._capsule_text_rects[self.dock_pos], Qt.AlignmentFlag.AlignCenter, time_str)
+
+    def draw_button(self, painter, color):
+        painter.setBrush(color)
         painter.setPen(Qt.PenStyle.NoPen)
 
         if self.is_running:
-            w, h = 6, 18
-            painter.drawRoundedRect(center.x() - 8, btn_y - h / 2, w, h, 2, 2)
-            painter.drawRoundedRect(center.x() + 2, btn_y - h / 2, w, h, 2, 2)
+            for bar in self._pause_bars:
+                painter.drawRoundedRect(bar, 2, 2)
         else:
-            path = QPainterPath()
-            x = center.x() - 4
-            y = btn_y
-            h = 16
-            path.moveTo(x, y - h / 2)
-            path.lineTo(x + 12, y)
-            path.lineTo(x, y + h / 2)
-            path.closeSubpath()
-            painter.drawPath(path)
+            painter.drawPolygon(self._play_poly)
 
     def mousePressEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton:
@@ -442,6 +637,7 @@ class UltimatePomodoro(QWidget):
         is_on_btn = (pos.y() > center_y + 30 and pos.y() < self.height() - 40) and not self.dock_pos
         if is_on_btn != self.is_hovering_btn:
             self.is_hovering_btn = is_on_btn
+            self.update()
         if event.buttons() == Qt.MouseButton.LeftButton and self.drag_pos:
             if self.dock_pos:
                 self.dock_pos = None
@@ -449,8 +645,29 @@ class UltimatePomodoro(QWidget):
             self.move(event.globalPosition().toPoint() - self.drag_pos)
             event.accept()
 
-    def check_docking(self):
+    def showEvent(self, event):
+        # 隐藏期间 _tick 不刷新系统时钟 (倒计时照常走，按时响铃)，重新显示时补一次
+        super().showEvent(event)
+        self.refresh_clock()
+
+    def closeEvent(self, event):
+        self.settings.flush()
+        super().closeEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton:
+            self._maybe_dock()
+        super().mouseReleaseEvent(event)
+
+    def moveEvent(self, event):
+        super().moveEvent(event)
+        # 拖动中不吸附 (松手时 mouseReleaseEvent 会检查)；吸附动画自身的移动也跳过
         if QApplication.mouseButtons() == Qt.MouseButton.LeftButton: return
+        if self._pos_anim and self._pos_anim.state() == QAbstractAnimation.State.Running: return
+        self._maybe_dock()
+
+    def _maybe_dock(self):
+        old_dock_pos = self.dock_pos
         geo = self.geometry()
         screen_geo = self.screen().geometry()
         snap_margin = 20
@@ -481,6 +698,7 @@ class UltimatePomodoro(QWidget):
                 self._pos_anim.setStartValue(self.pos())
                 self._pos_anim.setEndValue(target_pos)
                 self._pos_anim.setEasingCurve(QEasingCurve.Type.OutCubic)
+                self._pos_anim.valueChanged.connect(self.update)
                 self._pos_anim.start()
 
             pull_dist = 50
@@ -488,17 +706,47 @@ class UltimatePomodoro(QWidget):
             if self.dock_pos == 'left' and geo.x() > pull_dist: self.dock_pos = None
             if self.dock_pos == 'right' and geo.x() < screen_geo.width() - self.window_size - pull_dist: self.dock_pos = None
 
+        if self.dock_pos != old_dock_pos:
+            self.update()
+
+    def start_countdown(self):
+        if self._paused_remaining is None:
+            self._remaining_at_start = float(self.current_time)
+        else:
+            self._remaining_at_start = self._paused_remaining
+            self._paused_remaining = None
+        self._t0 = time.monotonic()
+
+    def remaining_seconds(self):
+        return max(0.0, self._remaining_at_start - (time.monotonic() - self._t0))
+
+    def sync_current_time(self, remaining=None):
+        if remaining is None:
+            remaining = self.remaining_seconds()
+        # 只在给显示用的 current_time 赋值时取整 (向上取整：开始的第一秒仍显示 25:00)
+        remaining = math.ceil(remaining)
+        if remaining != self.current_time:
+            self.current_time = remaining
+            self.update()
+
     def tick_timer(self):
         if self.is_running:
-            self.current_time -= 1
+            self.sync_current_time()
             if self.current_time <= 0:
                 self.finish_cycle()
 
     def toggle_timer(self):
+        if self.is_running:
+            self._paused_remaining = self.remaining_seconds()
+            self.sync_current_time(self._paused_remaining)
         self.is_running = not self.is_running
+        if self.is_running:
+            self.start_countdown()
+        self.update()
 
     def finish_cycle(self):
         self.is_running = False
+        self._paused_remaining = None
         self.update()
         self.audio_mgr.play(self.custom_mp3_path)
 
@@ -528,11 +776,14 @@ class UltimatePomodoro(QWidget):
                 self.current_time = self.total_time
                 self.is_running = True
 
-        theme = self.themes.get(self.current_theme, self.themes["Doro"])
-        dlg = ThemeDialog(title, msg, theme, self)
+        self.update()
+        dlg = ThemeDialog(title, msg, self._theme, self)
         screen = self.screen().geometry()
         dlg.move((screen.width() - dlg.width()) // 2, (screen.height() - dlg.height()) // 2)
         dlg.exec()
+        # 用户点了"我知道了"才开始下一阶段计时 (弹窗期间不算时间)
+        if self.is_running:
+            self.start_countdown()
         self.audio_mgr.stop()
 
     def show_context_menu(self, pos):
@@ -577,6 +828,7 @@ class UltimatePomodoro(QWidget):
         file_path, _ = QFileDialog.getOpenFileName(self, "选择铃声", "", "Audio Files (*.mp3 *.wav *.ogg *.flac)")
         if file_path:
             self.custom_mp3_path = file_path
+            self.audio_mgr.preload(file_path)
             self.settings.setValue("custom_mp3_path", file_path)
             QMessageBox.information(self, "成功", "铃声设置成功！")
 
@@ -586,10 +838,15 @@ class UltimatePomodoro(QWidget):
         if ok:
             self.custom_font_family = font.family()
             self.settings.setValue("font_family", self.custom_font_family)
+            self.init_fonts()
+            self.update()
 
     def set_theme(self, name):
+        QPixmapCache.remove(self.orb_background_key())
         self.current_theme = name
+        self._theme = self.themes.get(name, self.themes["Doro"])
         self.settings.setValue("theme", name)
+        self._cached_theme_key = None
         self.load_theme_image()
         self.update()
 
@@ -616,6 +873,7 @@ class UltimatePomodoro(QWidget):
 
     def reset_timer(self):
         self.is_running = False
+        self._paused_remaining = None
         duration = self.work_duration if self.mode == "WORK" else self.break_duration
         self.total_time = duration * 60
         self.current_time = self.total_time
@@ -636,4 +894,5 @@ if __name__ == "__main__":
     app = QApplication(sys.argv)
     clock = UltimatePomodoro()
     clock.show()
+    clock.audio_mgr.warmup()
     sys.exit(app.exec())
\ No newline at end of file